@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import List, Optional
 
 
@@ -18,7 +19,10 @@ class BaseDynamic(ABC):
         raise NotImplementedError()
 
     @staticmethod
+    @lru_cache(maxsize=128)
     def find_dynamic(text: str) -> Optional["BaseDynamic"]:
+        # Dynamics are frozen, so tasks sharing a dynamic string can share the
+        # parsed instance instead of re-matching every prefix on load.
         from .linear_dynamic import LinearDynamic
         from .linear_with_peak_dynamic import LinearWithPeakDynamic
         all_prefixes = []
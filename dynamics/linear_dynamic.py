@@ -8,7 +8,7 @@ log = logging.getLogger()
 log.setLevel("DEBUG")
 
 
-@dataclass
+@dataclass(frozen=True)
 class LinearDynamic(BaseDynamic):
     """
     In this dynamic, stress increases by 1 every X days.
@@ -17,8 +17,10 @@ class LinearDynamic(BaseDynamic):
     # How often should the stress increase by one
     interval: int
 
-    def apply(self, last_updated_date: datetime, base_stress: int) -> float:
-        offset = (datetime.now() - last_updated_date).days / self.interval
+    def apply(
+        self, last_updated_date: datetime, base_stress: int, now: datetime
+    ) -> float:
+        offset = (now - last_updated_date).days / self.interval
         log.debug(f"Linear dynamic applied a bonus: {base_stress} + {offset}")
         return base_stress + offset
 
@@ -3,7 +3,7 @@ from datetime import datetime
 from dynamics.base_dynamic import BaseDynamic
 
 
-@dataclass
+@dataclass(frozen=True)
 class LinearWithPeakDynamic(BaseDynamic):
     """
     In this dynamic, stress increases by 1 every X days, with a ceiling max.
@@ -12,8 +12,10 @@ class LinearWithPeakDynamic(BaseDynamic):
     interval: int
     peak: int
 
-    def apply(self, creation_date: datetime, base_stress: int) -> float:
-        offset = (datetime.now() - creation_date).days / self.interval
+    def apply(
+        self, creation_date: datetime, base_stress: int, now: datetime
+    ) -> float:
+        offset = (now - creation_date).days / self.interval
         return min(base_stress + offset, self.peak)
 
     _full_prefix = "dynamic-linear-day-peaked."
@@ -11,8 +11,6 @@ from typing import Callable, List, Optional, TypeVar, Union
 import ast
 import logging
 
-import croniter
-
 from dynamics.base_dynamic import BaseDynamic
 from task import Task
 
@@ -430,7 +428,7 @@ class App:
                     # Real quick... if they changed the stress,
                     # update the last_refreshed date too
                     if int(task_to_edit.get_rendered_stress()) != int(stress):
-                        task_to_edit.last_refreshed = datetime.now()
+                        task_to_edit.update_last_refreshed()
 
                     task_to_edit.stress = stress
                     task_to_edit.is_complete = is_complete
@@ -469,6 +467,8 @@ class App:
         def validator(val):
             if not val:
                 return None
+            import croniter
+
             try:
                 cron = croniter.croniter(val, datetime.now())
                 cron.get_next(datetime)
@@ -559,12 +559,14 @@ class App:
         tasks = task_list_override or self.all_tasks
         if not extend_cache:
             self.cached_listed_tasks = {}
+        tasks_by_id = Task.index_by_identifier(tasks)
+        dependents_by_id = Task.index_dependents(tasks)
         incomplete_tasks = [
             task
             for task in tasks
             if (not smart_filter)
             or not task.is_complete
-            and task.dependent_tasks_complete(tasks)
+            and task.dependent_tasks_complete(tasks, tasks_by_id)
         ]
         start_index = (
             0
@@ -584,7 +586,7 @@ class App:
         for idx, task in enumerate(incomplete_tasks):
             true_idx = idx + start_index
             space_padding = " " * (int(max_digit_length) - int(true_idx / 10))
-            dependent_count = task.get_dependent_count(tasks)
+            dependent_count = task.get_dependent_count(tasks, dependents_by_id)
             due_soon_indicator = "⏰ " if task.is_due_soon() else ""
             to_return.append(
                 f"[{true_idx}]  {space_padding}{due_soon_indicator}{f'(+{dependent_count}) ' if dependent_count else ''}{task.headline()}"
@@ -667,8 +669,7 @@ class App:
             ]
             if not remaining_tasks:
                 return
-            remaining_tasks.sort(key=lambda t: t.last_refreshed, reverse=False)
-            chosen_task = remaining_tasks[0]
+            chosen_task = min(remaining_tasks, key=lambda t: t.last_refreshed)
             if not chosen_task:
                 return
             seen_tasks.add(chosen_task)
@@ -680,7 +681,7 @@ class App:
                 return
             found_task = self.find_task(chosen_task.title)
             if found_task:
-                found_task.last_refreshed = datetime.now()
+                found_task.update_last_refreshed()
                 if new_stress != "":
                     found_task.stress = new_stress
 
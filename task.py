@@ -5,17 +5,63 @@ import os
 import subprocess
 import tempfile
 from datetime import datetime, timedelta
-from typing import List
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 import uuid
-import icalendar
-import croniter
 
 from dynamics.base_dynamic import BaseDynamic
 
+if TYPE_CHECKING:
+    import croniter
+
 log = logging.getLogger()
 
+_ONE_DAY = timedelta(days=1)
+_ONE_WEEK = timedelta(weeks=1)
+
+
+@lru_cache(maxsize=512)
+def _get_shared_croniter(expr: str) -> "croniter.croniter":
+    import croniter
+
+    return croniter.croniter(expr)
+
+
+def _croniter_from(expr: str, start: datetime) -> "croniter.croniter":
+    """
+    A croniter for expr positioned at start. Parsing is only done once per
+    expression, the instance is shared so this is not thread safe.
+    """
+    cron = _get_shared_croniter(expr)
+    cron.set_current(start, force=True)
+    return cron
+
+
+@lru_cache(maxsize=256)
+def _simple_cron_schedule(expr: str) -> Optional[Tuple[int, int, Optional[int]]]:
+    """
+    Recognize crons that fire once a day or once a week at a fixed time,
+    e.g. "0 8 * * *" or "30 9 * * 1". Returns (minute, hour, day_of_week),
+    day_of_week being None for daily crons, or None for any other cron.
+    """
+    fields = expr.split()
+    if len(fields) != 5:
+        return None
+    minute, hour, day_of_month, month, day_of_week = fields
+    if day_of_month != "*" or month != "*":
+        return None
+    if not (minute.isdigit() and hour.isdigit()):
+        return None
+    if int(minute) > 59 or int(hour) > 23:
+        return None
+    if day_of_week == "*":
+        return int(minute), int(hour), None
+    if day_of_week.isdigit() and int(day_of_week) <= 7:
+        return int(minute), int(hour), int(day_of_week) % 7
+    return None
+
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     _DEFAULT_REFRESHED = datetime(1970, 1, 1)
 
@@ -26,33 +72,59 @@ class Task:
     stress: int
     _is_complete: bool = False
     due_date: datetime = None
-    last_refreshed: datetime = field(default_factory=datetime.now)
+    last_refreshed: datetime = field(default_factory=lambda: Task._now())
     identifier: str = field(default_factory=lambda: str(uuid.uuid4()))
     dependent_on: List[int] = field(default_factory=lambda: [])
     stress_dynamic: BaseDynamic = None
-    creation_date: datetime = field(default_factory=datetime.now)
+    creation_date: datetime = field(default_factory=lambda: Task._now())
     list_name: str = "default"
     cool_down: str = None
     periodicity: str = None
+    _cool_down_reset: Tuple[str, datetime, datetime] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _periodic_window: Tuple[str, datetime, datetime] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @staticmethod
+    def _now() -> datetime:
+        """
+        The single clock read for task logic, including field defaults and
+        stress dynamics. Patch this to control time.
+        """
+        return datetime.now()
 
     @property
     def is_complete(self):
+        return self.is_complete_at(self._now())
+
+    @is_complete.setter
+    def is_complete(self, val):
+        if val is not None:
+            self._is_complete = val
+            self.update_last_refreshed()
+
+    def is_complete_at(self, now: datetime) -> bool:
+        if not (self.cool_down or self.periodicity):
+            # Plain tasks are complete exactly when they were marked complete
+            return self._is_complete
         log.debug(f"Evaluating is_complete for task named: {self.title}")
         if not self._is_complete:
             log.debug("Task is incomplete, returning incomplete.")
             return self._is_complete
         if self.cool_down:
             log.debug("Cool down is configured. Let's evaluate.")
-            time_since_last_completion = datetime.now() - self.last_refreshed
-            expected_interval = self.convert_cool_down_str_to_delta(self.cool_down)
-            log.debug(f"The specified interval is {expected_interval}, it's been {time_since_last_completion}")
-            if time_since_last_completion > (expected_interval * .9):
+            reset_at = self.get_cool_down_reset_date()
+            log.debug(f"The cool down resets at {reset_at}, it's now {now}")
+            if now > reset_at:
                 return False
             return True
         if self.periodicity:
-            cron = croniter.croniter(self.periodicity, datetime.now())
-            next_time_to_complete = cron.get_next(datetime)
-            previous_time_to_complete = cron.get_prev(datetime)
+            (
+                previous_time_to_complete,
+                next_time_to_complete,
+            ) = self.get_periodic_window(now)
             interval = next_time_to_complete - previous_time_to_complete
             buffer = interval * .10
             reset_at = next_time_to_complete - buffer
@@ -61,18 +133,64 @@ class Task:
                 # We missed a chance, bump it to incomplete
                 return False
 
-            if datetime.now() > reset_at:
+            if now > reset_at:
                 return False
             return True
         return self._is_complete
 
-    @is_complete.setter
-    def is_complete(self, val):
-        if val is not None:
-            self._is_complete = val
-            self.update_last_refreshed()
+    def get_periodic_window(self, now: datetime) -> Tuple[datetime, datetime]:
+        """
+        Find the periodicity occurrences immediately before and after now.
+        The window is reused until now leaves it or the periodicity changes.
+        """
+        cached = self._periodic_window
+        if cached and cached[0] == self.periodicity and cached[1] <= now < cached[2]:
+            return cached[1], cached[2]
+        previous_time, next_time = self._compute_periodic_window(now)
+        self._periodic_window = (self.periodicity, previous_time, next_time)
+        return previous_time, next_time
+
+    def _compute_periodic_window(self, now: datetime) -> Tuple[datetime, datetime]:
+        """
+        Daily and weekly crons at a fixed time are computed directly, anything
+        else is walked with croniter.
+        """
+        schedule = _simple_cron_schedule(self.periodicity)
+        if schedule:
+            minute, hour, day_of_week = schedule
+            next_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if day_of_week is None:
+                period = _ONE_DAY
+            else:
+                period = _ONE_WEEK
+                # Cron counts weekdays from Sunday, python from Monday
+                next_time += _ONE_DAY * ((day_of_week - 1 - now.weekday()) % 7)
+            if next_time <= now:
+                next_time += period
+            return next_time - period, next_time
+        cron = _croniter_from(self.periodicity, now)
+        next_time = cron.get_next(datetime)
+        return cron.get_prev(datetime), next_time
+
+    def get_cool_down_reset_date(self) -> datetime:
+        """
+        When a completed task with a cool down becomes incomplete again, kept
+        until the task is refreshed or its cool down changes.
+        """
+        cached = self._cool_down_reset
+        if (
+            cached
+            and cached[0] == self.cool_down
+            and cached[1] == self.last_refreshed
+        ):
+            return cached[2]
+        expected_interval = self.convert_cool_down_str_to_delta(self.cool_down)
+        reset_at = self.last_refreshed + expected_interval * 0.9
+        self._cool_down_reset = (self.cool_down, self.last_refreshed, reset_at)
+        return reset_at
 
     @staticmethod
+    @lru_cache(maxsize=128)
     def convert_cool_down_str_to_delta(cool_down: str) -> timedelta:
         if "min" in cool_down:
             return timedelta(minutes=int(cool_down.split("min")[0]))
@@ -89,10 +207,10 @@ class Task:
         base_stress = self.stress
         if not self.stress_dynamic:
             return base_stress
-        return self.stress_dynamic.apply(self.last_refreshed, self.stress)
+        return self.stress_dynamic.apply(self.last_refreshed, self.stress, self._now())
 
     def update_last_refreshed(self):
-        self.last_refreshed = datetime.now()
+        self.last_refreshed = self._now()
     
     def __key(self):
         return (self.title, self.description)
@@ -106,6 +224,8 @@ class Task:
         return NotImplemented
 
     def create_and_launch_ical_event(self):
+        import icalendar
+
         cal = icalendar.Calendar()
         cal.add("prodid", "-//My calendar product//mxm.dk//")
         cal.add("version", "2.0")
@@ -116,7 +236,7 @@ class Task:
         def round_dt_up(dt, delta=timedelta(minutes=15)):
             return datetime.min + math.ceil((dt - datetime.min) / delta) * delta
 
-        rounded_start = round_dt_up(datetime.now())
+        rounded_start = round_dt_up(self._now())
         event.add("dtstart", rounded_start)
         event.add("dtend", rounded_start + timedelta(minutes=self.duration))
         cal.add_component(event)
@@ -126,17 +246,17 @@ class Task:
         f.close()
         subprocess.call(("open", f.name))
 
-    def get_dependent_count(self, all_tasks: List["Task"]) -> int:
-        count = 0
-        for task in all_tasks:
-            if self.identifier in task.dependent_on:
-                count += 1
-        return count
+    def get_dependent_count(
+        self,
+        all_tasks: List["Task"],
+        dependents_by_id: Optional[Dict[str, List["Task"]]] = None,
+    ) -> int:
+        return len(self.find_dependents(all_tasks, dependents_by_id))
 
     def is_due_soon(self):
         if not self.due_date:
             return False
-        due_in = self.due_date - datetime.now()
+        due_in = self.due_date - self._now()
         if due_in < timedelta(0):
             # Already due
             return True
@@ -147,7 +267,7 @@ class Task:
         return False
 
     def get_date_str(self, datetime: datetime):
-        delta = datetime - datetime.now()
+        delta = datetime - self._now()
         if delta < timedelta(0):
             return f"-{delta.days} days"
         return f"{round(delta / timedelta(days=1), 2)} days"
@@ -166,20 +286,42 @@ class Task:
                 ][0]
                 print(f"* [{found.identifier}] {found.title}\n")
 
-    def find_dependents(self, all_tasks: List["Task"]) -> List["Task"]:
-        to_return = []
-        for task in all_tasks:
-            if self.identifier in task.dependent_on:
-                to_return.append(task)
-        return to_return
+    def find_dependents(
+        self,
+        all_tasks: List["Task"],
+        dependents_by_id: Optional[Dict[str, List["Task"]]] = None,
+    ) -> List["Task"]:
+        if dependents_by_id is None:
+            dependents_by_id = Task.index_dependents(all_tasks)
+        return dependents_by_id.get(self.identifier, [])
 
-    def dependent_tasks_complete(self, all_tasks: List["Task"]) -> bool:
-        saw_incomplete = False
+    def dependent_tasks_complete(
+        self,
+        all_tasks: List["Task"],
+        tasks_by_id: Optional[Dict[str, "Task"]] = None,
+    ) -> bool:
+        if tasks_by_id is None:
+            tasks_by_id = Task.index_by_identifier(all_tasks)
         for task_id in self.dependent_on:
-            found = [t for t in all_tasks if t.identifier == task_id][0]
-            if not found._is_complete:
-                saw_incomplete = True
-        return not saw_incomplete
+            if not tasks_by_id[task_id]._is_complete:
+                return False
+        return True
+
+    @staticmethod
+    def index_by_identifier(all_tasks: List["Task"]) -> Dict[str, "Task"]:
+        return {task.identifier: task for task in all_tasks}
+
+    @staticmethod
+    def index_dependents(all_tasks: List["Task"]) -> Dict[str, List["Task"]]:
+        """
+        Map each task identifier to the tasks that depend on it, so callers
+        looking up dependents for a whole list only scan it once.
+        """
+        dependents_by_id = {}
+        for task in all_tasks:
+            for task_id in dict.fromkeys(task.dependent_on):
+                dependents_by_id.setdefault(task_id, []).append(task)
+        return dependents_by_id
 
     def headline(self):
         return f"{self.title} ({self.duration}min, stress: {int(self.get_rendered_stress())}, diff: {self.difficulty}{(', ' + self.get_date_str(self.due_date)) if self.due_date else ''})"
@@ -213,7 +355,7 @@ class Task:
             else None,
             creation_date=datetime.fromisoformat(creation_date)
             if creation_date
-            else datetime.now(),
+            else Task._now(),
             list_name=incoming_dict.get("list_name", "default"),
             cool_down=incoming_dict.get("cool_down"),
             periodicity=incoming_dict.get("periodicity")